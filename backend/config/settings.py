@@ -91,6 +91,13 @@ DATABASES = {
     }
 }
 
+# Read replica used by the read-only GraphQL resolvers. Derived from default so
+# connection settings can't drift; point HOST at the replica once one exists.
+DATABASES['replica'] = {**DATABASES['default'], 'TEST': {'MIRROR': 'default'}}
+
+# Keep writes and migrations on the primary; reads opt in with .using('replica')
+DATABASE_ROUTERS = ['core.routers.PrimaryReplicaRouter']
+
 # Authentication Backends
 # REQUIRED for JWT Authentication to work
 AUTHENTICATION_BACKENDS = [
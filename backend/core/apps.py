@@ -3,3 +3,7 @@ from django.apps import AppConfig
 
 class CoreConfig(AppConfig):
     name = 'core'
+
+    def ready(self):
+        # Register the Task signal handlers that maintain Project counters
+        from . import signals  # noqa: F401
@@ -0,0 +1,33 @@
+from django.db import migrations, models
+from django.db.models import Count, Q
+
+
+def backfill_task_counters(apps, schema_editor):
+    Project = apps.get_model('core', 'Project')
+    counts = Project.objects.annotate(
+        total=Count('tasks'),
+        done=Count('tasks', filter=Q(tasks__status='DONE')),
+    )
+    for project in counts:
+        Project.objects.filter(pk=project.pk).update(task_total=project.total, task_done=project.done)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0005_organization_owner'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='project',
+            name='task_done',
+            field=models.IntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name='project',
+            name='task_total',
+            field=models.IntegerField(default=0, editable=False),
+        ),
+        migrations.RunPython(backfill_task_counters, migrations.RunPython.noop),
+    ]
@@ -3,6 +3,7 @@ from django.contrib.auth.models import User
 
 class Organization(models.Model):
     name = models.CharField(max_length=100)
+    # unique=True already creates the index that Register's get_or_create probes
     slug = models.SlugField(unique=True)
     members = models.ManyToManyField(User, related_name='organizations')
     # NEW: The user who owns/manages the organization
@@ -25,6 +26,9 @@ class Project(models.Model):
     status = models.CharField(max_length=20, choices=STATUS_CHOICES, default='ACTIVE')
     due_date = models.DateField(null=True, blank=True)
     created_at = models.DateTimeField(auto_now_add=True)
+    # Denormalized task counters, kept in sync by core.signals
+    task_total = models.IntegerField(default=0, editable=False)
+    task_done = models.IntegerField(default=0, editable=False)
 
     def __str__(self):
         return self.name
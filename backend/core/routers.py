@@ -0,0 +1,11 @@
+class PrimaryReplicaRouter:
+    # Writes always go to the primary; the replica is only read via explicit .using('replica')
+    def db_for_write(self, model, **hints):
+        return 'default'
+
+    def allow_relation(self, obj1, obj2, **hints):
+        # Both connections hold the same data
+        return True
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        return db == 'default'
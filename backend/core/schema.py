@@ -1,9 +1,27 @@
 import graphene
-from graphene_django import DjangoObjectType
 import graphql_jwt
+from graphql_jwt.shortcuts import get_token
+from query_optimizer import DjangoConnectionField, DjangoObjectType, MultiField, optimize_single
 from django.contrib.auth.models import User
+from django.db import IntegrityError, transaction
+from django.db.models import Q
 from django.utils.text import slugify
 from .models import Organization, Project, Task, TaskComment
+from .signals import refresh_task_done
+
+def _user(info):
+    # Resolve the request user once and reuse it across every resolver in the request
+    context = info.context
+    if not hasattr(context, '_gql_user'):
+        context._gql_user = context.user
+    return context._gql_user
+
+def _optimized_payload(queryset, info, instance):
+    # Mutation payloads bypass the query resolvers, so re-read the row through the
+    # optimizer to plan any nested relations the client selected
+    if instance is None:
+        return None
+    return optimize_single(queryset, info, pk=instance.pk)
 
 # --- Types ---
 class UserType(DjangoObjectType):
@@ -15,17 +33,17 @@ class OrganizationType(DjangoObjectType):
     class Meta:
         model = Organization
         fields = "__all__"
+        # Needed for the paginated all_organizations connection
+        use_connection = True
     
-    projects = graphene.List(lambda: ProjectType)
-    # NEW: Expose admin status to frontend
-    is_admin = graphene.Boolean()
-
-    def resolve_projects(self, info):
-        return Project.objects.filter(organization=self)
+    # NEW: Expose admin status to frontend (owner is listed so the optimizer loads it)
+    is_admin = MultiField(graphene.Boolean, fields=['owner'])
 
     def resolve_is_admin(self, info):
         # Returns True if the logged-in user is the owner of this organization
-        return self.owner == info.context.user
+        # Compare ids so the owner row is never loaded. This needs no I/O at all,
+        # so it is deliberately not cached: a cache lookup would be the slower path.
+        return self.owner_id is not None and self.owner_id == _user(info).pk
 
 class TaskCommentType(DjangoObjectType):
     class Meta:
@@ -40,19 +58,19 @@ class TaskType(DjangoObjectType):
 class ProjectType(DjangoObjectType):
     class Meta:
         model = Project
-        fields = "__all__"
+        # Internal counters; clients read taskCount / completionRate instead
+        exclude = ("task_total", "task_done")
     
-    task_count = graphene.Int()
-    completion_rate = graphene.Float()
+    # Read from the denormalized counters on Project, so no task queries are needed
+    task_count = MultiField(graphene.Int, fields=['task_total'])
+    completion_rate = MultiField(graphene.Float, fields=['task_total', 'task_done'])
 
     def resolve_task_count(self, info):
-        return self.tasks.count()
+        return self.task_total
 
     def resolve_completion_rate(self, info):
-        total = self.tasks.count()
-        if total == 0: return 0.0
-        completed = self.tasks.filter(status='DONE').count()
-        return (completed / total) * 100
+        if self.task_total == 0: return 0.0
+        return (self.task_done / self.task_total) * 100
 
 # --- Queries ---
 class Query(graphene.ObjectType):
@@ -66,37 +84,41 @@ class Query(graphene.ObjectType):
     me = graphene.Field(UserType)
     
     # Allow fetching all orgs (useful if you want to switch context in future)
-    all_organizations = graphene.List(OrganizationType)
+    # Paginated with a server-side cap so the whole table is never loaded at once
+    all_organizations = DjangoConnectionField(OrganizationType, max_limit=100)
 
     def resolve_me(self, info):
-        user = info.context.user
+        user = _user(info)
         if user.is_authenticated:
             return user
         return None
 
     def resolve_my_organization(self, info):
-        user = info.context.user
+        user = _user(info)
         if not user.is_authenticated:
             return None
         # Return the first organization the user is a member of
-        return user.organizations.first()
+        org_id = user.organizations.using('replica').values_list('pk', flat=True).first()
+        if org_id is None:
+            return None
+        return optimize_single(Organization.objects.using('replica').all(), info, pk=org_id)
 
     def resolve_project(self, info, id):
-        user = info.context.user
+        user = _user(info)
         if not user.is_authenticated:
             raise Exception("Not logged in")
         
-        try:
-            project = Project.objects.get(pk=id)
-            # Security Check: Ensure user is member of project's org
-            if user not in project.organization.members.all():
-                raise Exception("Access Denied")
-            return project
-        except Project.DoesNotExist:
-            return None
-
-    def resolve_all_organizations(self, info):
-        return Organization.objects.all()
+        # Security Check: only match the project if the user is a member of its org.
+        # One query covers existence, permission and retrieval, and a miss is a plain
+        # None rather than a caught DoesNotExist.
+        project = optimize_single(Project.objects.using('replica').filter(organization__members=user), info, pk=id)
+        if project is None:
+            raise Exception("Not found or access denied")
+        return project
+
+    def resolve_all_organizations(self, info, **kwargs):
+        # The connection field optimizes (and projects columns) after slicing, so return a plain queryset
+        return Organization.objects.using('replica').order_by('pk')
 
 # --- Mutations ---
 
@@ -113,32 +135,33 @@ class Register(graphene.Mutation):
     token = graphene.String()
 
     def mutate(self, info, username, password, email, organization_name):
-        # 1. Create User
-        if User.objects.filter(username=username).exists():
-            raise Exception("Username already exists")
-        
-        user = User.objects.create_user(username=username, email=email, password=password)
-        
-        # 2. Handle Organization
         slug = slugify(organization_name)
-        
+
+        # User, organization and membership are written together or not at all
         try:
-            # Try to join existing org
-            org = Organization.objects.get(slug=slug)
-        except Organization.DoesNotExist:
-            # Create NEW org and set current user as OWNER
-            org = Organization.objects.create(name=organization_name, slug=slug, owner=user)
-        
-        # 3. Link User to Org
-        org.members.add(user)
-        org.save()
+            with transaction.atomic():
+                # 1. Create User (the unique username constraint rejects duplicates)
+                user = User.objects.create_user(username=username, email=email, password=password)
+
+                # 2. Join existing org, or create NEW org with current user as OWNER
+                org, created = Organization.objects.get_or_create(
+                    slug=slug, defaults={'name': organization_name, 'owner': user}
+                )
+
+                # 3. Link User to Org (the user is brand new, so skip add()'s existing-row check)
+                Membership = Organization.members.through
+                Membership.objects.bulk_create([Membership(organization_id=org.pk, user_id=user.pk)])
+        except IntegrityError:
+            raise Exception("Username already exists")
 
         # 4. Generate Token
-        from graphql_jwt.shortcuts import get_token
         token = get_token(user)
 
         return Register(user=user, organization=org, token=token)
 
+    def resolve_organization(self, info):
+        return _optimized_payload(Organization.objects.all(), info, self.organization)
+
 class CreateProject(graphene.Mutation):
     class Arguments:
         org_slug = graphene.String(required=True)
@@ -149,11 +172,15 @@ class CreateProject(graphene.Mutation):
     project = graphene.Field(ProjectType)
 
     def mutate(self, info, org_slug, name, description="", due_date=None):
-        org = Organization.objects.get(slug=org_slug)
+        # Only the primary key is needed to link the new project
+        org_id = Organization.objects.values_list('pk', flat=True).get(slug=org_slug)
         if due_date == "": due_date = None
-        project = Project.objects.create(organization=org, name=name, description=description, due_date=due_date)
+        project = Project.objects.create(organization_id=org_id, name=name, description=description, due_date=due_date)
         return CreateProject(project=project)
 
+    def resolve_project(self, info):
+        return _optimized_payload(Project.objects.all(), info, self.project)
+
 class UpdateTask(graphene.Mutation):
     class Arguments:
         task_id = graphene.ID(required=True)
@@ -165,44 +192,71 @@ class UpdateTask(graphene.Mutation):
     task = graphene.Field(TaskType)
 
     def mutate(self, info, task_id, status=None, description=None, assignee_email=None, due_date=None):
-        task = Task.objects.get(pk=task_id)
-        user = info.context.user
+        user = _user(info)
+        changes = {}
 
         # SECURITY CHECK: Only Admin/Owner can assign tasks
         if assignee_email is not None:
-            # Check if organization has an owner and if the current user is NOT that owner
-            if task.project.organization.owner and task.project.organization.owner != user:
+            # Allowed if the organization has no owner or the current user is that owner
+            allowed = Task.objects.filter(
+                Q(project__organization__owner__isnull=True) | Q(project__organization__owner_id=user.pk),
+                pk=task_id,
+            ).exists()
+            if not allowed:
+                # Only pay for the second probe on the failure path, to tell a missing task from a denial
+                if not Task.objects.filter(pk=task_id).exists():
+                    raise Task.DoesNotExist("Task matching query does not exist.")
                 raise Exception("Only the Organization Admin can assign tasks.")
-            task.assignee_email = assignee_email
+            changes['assignee_email'] = assignee_email
 
-        if status: task.status = status
-        if description is not None: task.description = description
-        if due_date is not None: task.due_date = None if due_date == "" else due_date
-        
-        task.save()
+        if status: changes['status'] = status
+        if description is not None: changes['description'] = description
+        if due_date is not None: changes['due_date'] = None if due_date == "" else due_date
+
+        # Write only the columns that changed
+        if changes:
+            Task.objects.filter(pk=task_id).update(**changes)
+        task = Task.objects.get(pk=task_id)
+        # QuerySet.update() skips post_save, so keep the project's DONE counter in sync here
+        if 'status' in changes:
+            refresh_task_done(task.project_id)
         return UpdateTask(task=task)
 
+    def resolve_task(self, info):
+        return _optimized_payload(Task.objects.all(), info, self.task)
+
 class UpdateProject(graphene.Mutation):
     class Arguments:
         project_id = graphene.ID(required=True)
         status = graphene.String()
     project = graphene.Field(ProjectType)
     def mutate(self, info, project_id, status):
+        # Write only the status column instead of re-saving the whole row
+        Project.objects.filter(pk=project_id).update(status=status)
         project = Project.objects.get(pk=project_id)
-        project.status = status
-        project.save()
         return UpdateProject(project=project)
 
+    def resolve_project(self, info):
+        return _optimized_payload(Project.objects.all(), info, self.project)
+
 class CreateTask(graphene.Mutation):
     class Arguments:
         project_id = graphene.ID(required=True)
         title = graphene.String(required=True)
     task = graphene.Field(TaskType)
     def mutate(self, info, project_id, title):
-        project = Project.objects.get(pk=project_id)
-        task = Task.objects.create(project=project, title=title)
+        # The foreign key constraint rejects unknown projects, so no lookup is needed
+        try:
+            # atomic() so the deferred FK check fires here, and rolls back the counter update with it
+            with transaction.atomic():
+                task = Task.objects.create(project_id=project_id, title=title)
+        except IntegrityError:
+            raise Exception("Project not found")
         return CreateTask(task=task)
 
+    def resolve_task(self, info):
+        return _optimized_payload(Task.objects.all(), info, self.task)
+
 class AddComment(graphene.Mutation):
     class Arguments:
         task_id = graphene.ID(required=True)
@@ -211,7 +265,7 @@ class AddComment(graphene.Mutation):
     comment = graphene.Field(TaskCommentType)
 
     def mutate(self, info, task_id, content):
-        user = info.context.user
+        user = _user(info)
         if not user.is_authenticated:
             raise Exception("You must be logged in to comment.")
 
@@ -225,6 +279,9 @@ class AddComment(graphene.Mutation):
         )
         return AddComment(comment=comment)
 
+    def resolve_comment(self, info):
+        return _optimized_payload(TaskComment.objects.all(), info, self.comment)
+
 class Mutation(graphene.ObjectType):
     token_auth = graphql_jwt.ObtainJSONWebToken.Field() # Built-in Login
     verify_token = graphql_jwt.Verify.Field()
@@ -0,0 +1,68 @@
+from django.db.models import Count, F, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+from django.db.models.signals import post_delete, post_save, pre_save
+from django.dispatch import receiver
+
+from .models import Project, Task
+
+
+def refresh_task_done(project_id):
+    # Recount DONE tasks in SQL; used when a task's status may have changed
+    done = (
+        Task.objects.filter(project=OuterRef('pk'), status='DONE')
+        .order_by()
+        .values('project')
+        .annotate(count=Count('pk'))
+        .values('count')
+    )
+    Project.objects.filter(pk=project_id).update(task_done=Coalesce(Subquery(done), 0))
+
+
+@receiver(pre_save, sender=Task)
+def task_saving(sender, instance, update_fields=None, **kwargs):
+    # Remember the stored project/status so post_save can tell what changed
+    instance._counter_previous = None
+    if instance._state.adding:
+        return
+    if update_fields is not None and not {'project', 'project_id', 'status'} & set(update_fields):
+        return
+    instance._counter_previous = (
+        Task.objects.filter(pk=instance.pk).values_list('project_id', 'status').first()
+    )
+
+
+@receiver(post_save, sender=Task)
+def task_saved(sender, instance, created, **kwargs):
+    done = 1 if instance.status == 'DONE' else 0
+    if created:
+        Project.objects.filter(pk=instance.project_id).update(
+            task_total=F('task_total') + 1,
+            task_done=F('task_done') + done,
+        )
+        return
+
+    previous = getattr(instance, '_counter_previous', None)
+    if previous is None:
+        return
+    previous_project_id, previous_status = previous
+    was_done = 1 if previous_status == 'DONE' else 0
+    if previous_project_id != instance.project_id:
+        # Moved: take the task off the old project and count it on the new one
+        Project.objects.filter(pk=previous_project_id).update(
+            task_total=F('task_total') - 1,
+            task_done=F('task_done') - was_done,
+        )
+        Project.objects.filter(pk=instance.project_id).update(
+            task_total=F('task_total') + 1,
+            task_done=F('task_done') + done,
+        )
+    elif done != was_done:
+        Project.objects.filter(pk=instance.project_id).update(task_done=F('task_done') + done - was_done)
+
+
+@receiver(post_delete, sender=Task)
+def task_deleted(sender, instance, **kwargs):
+    Project.objects.filter(pk=instance.project_id).update(
+        task_total=F('task_total') - 1,
+        task_done=F('task_done') - (1 if instance.status == 'DONE' else 0),
+    )
@@ -1,3 +1,147 @@
-from django.test import TestCase
+import importlib
+import json
 
-# Create your tests here.
+from django.apps import apps
+from django.contrib.auth.models import User
+from django.db import connection
+from django.test import TestCase, TransactionTestCase
+from django.test.utils import CaptureQueriesContext
+
+from .models import Organization, Project, Task
+
+
+class ProjectTaskCounterTests(TestCase):
+    def setUp(self):
+        org = Organization.objects.create(name="Acme", slug="acme")
+        self.project = Project.objects.create(organization=org, name="Launch")
+
+    def assertCounters(self, total, done):
+        self.project.refresh_from_db()
+        self.assertEqual((self.project.task_total, self.project.task_done), (total, done))
+
+    def update_task_status(self, task, status):
+        query = 'mutation($id: ID!, $status: String) { updateTask(taskId: $id, status: $status) { task { id status } } }'
+        response = self.client.post(
+            '/graphql/',
+            json.dumps({'query': query, 'variables': {'id': task.pk, 'status': status}}),
+            content_type='application/json',
+        )
+        self.assertEqual(response.status_code, 200)
+        self.assertNotIn('errors', response.json())
+
+    def test_create_counts_task(self):
+        Task.objects.create(project=self.project, title="Todo")
+        Task.objects.create(project=self.project, title="Done", status='DONE')
+        self.assertCounters(total=2, done=1)
+
+    def test_update_task_toggles_done(self):
+        task = Task.objects.create(project=self.project, title="Write docs")
+        self.update_task_status(task, 'DONE')
+        self.assertCounters(total=1, done=1)
+        self.update_task_status(task, 'IN_PROGRESS')
+        self.assertCounters(total=1, done=0)
+
+    def test_delete_uncounts_task(self):
+        todo = Task.objects.create(project=self.project, title="Todo")
+        done = Task.objects.create(project=self.project, title="Done", status='DONE')
+        done.delete()
+        self.assertCounters(total=1, done=0)
+        todo.delete()
+        self.assertCounters(total=0, done=0)
+
+    def test_save_without_status_change_leaves_counters(self):
+        task = Task.objects.create(project=self.project, title="Todo")
+        task.title = "Renamed"
+        with CaptureQueriesContext(connection) as queries:
+            task.save()
+        self.assertFalse(any('"core_project"' in query['sql'] for query in queries.captured_queries))
+        self.assertCounters(total=1, done=0)
+
+    def test_save_with_status_change_updates_done(self):
+        task = Task.objects.create(project=self.project, title="Todo")
+        task.status = 'DONE'
+        task.save()
+        self.assertCounters(total=1, done=1)
+        task.status = 'TODO'
+        task.save(update_fields=['status'])
+        self.assertCounters(total=1, done=0)
+
+    def test_moving_task_updates_both_projects(self):
+        other = Project.objects.create(organization=self.project.organization, name="Other")
+        Task.objects.create(project=self.project, title="Stays")
+        task = Task.objects.create(project=self.project, title="Moves", status='DONE')
+        task.project = other
+        task.save()
+        self.assertCounters(total=1, done=0)
+        other.refresh_from_db()
+        self.assertEqual((other.task_total, other.task_done), (1, 1))
+
+    def test_backfill_recomputes_counters(self):
+        Task.objects.create(project=self.project, title="Todo")
+        Task.objects.create(project=self.project, title="Done", status='DONE')
+        Project.objects.update(task_total=0, task_done=0)
+
+        migration = importlib.import_module('core.migrations.0006_project_task_counters')
+        migration.backfill_task_counters(apps, None)
+        self.assertCounters(total=2, done=1)
+
+
+class MutationPayloadQueryTests(TestCase):
+    def test_nested_payload_relations_are_prefetched(self):
+        org = Organization.objects.create(name="Acme", slug="acme")
+        project = Project.objects.create(organization=org, name="Launch")
+        for title in ("One", "Two", "Three"):
+            Task.objects.create(project=project, title=title)
+
+        query = 'mutation($id: ID!) { createTask(projectId: $id, title: "Four") { task { project { tasks { id } } } } }'
+        # SAVEPOINT, INSERT, counter UPDATE, RELEASE, task + project SELECT, tasks prefetch;
+        # independent of the task count
+        with self.assertNumQueries(6):
+            response = self.client.post(
+                '/graphql/',
+                json.dumps({'query': query, 'variables': {'id': project.pk}}),
+                content_type='application/json',
+            )
+        tasks = response.json()['data']['createTask']['task']['project']['tasks']
+        self.assertEqual(len(tasks), 4)
+
+
+class CreateTaskTests(TransactionTestCase):
+    # TransactionTestCase so the deferred foreign key check actually runs on commit
+    def test_unknown_project_reports_not_found(self):
+        query = 'mutation { createTask(projectId: 999, title: "Orphan") { task { id } } }'
+        response = self.client.post('/graphql/', json.dumps({'query': query}), content_type='application/json')
+        self.assertEqual(response.json()['errors'][0]['message'], "Project not found")
+        self.assertFalse(Task.objects.exists())
+
+
+class ProjectTypeFieldTests(TestCase):
+    def test_counter_columns_are_not_exposed(self):
+        from .schema import ProjectType
+
+        fields = ProjectType._meta.fields
+        self.assertIn('task_count', fields)
+        self.assertIn('completion_rate', fields)
+        self.assertNotIn('task_total', fields)
+        self.assertNotIn('task_done', fields)
+
+
+class UpdateTaskAssignTests(TestCase):
+    def assign(self, task_id):
+        query = 'mutation($id: ID!) { updateTask(taskId: $id, assigneeEmail: "dev@example.com") { task { id } } }'
+        response = self.client.post(
+            '/graphql/',
+            json.dumps({'query': query, 'variables': {'id': task_id}}),
+            content_type='application/json',
+        )
+        return response.json()['errors'][0]['message']
+
+    def test_missing_task_is_not_reported_as_permission_error(self):
+        self.assertEqual(self.assign(999), "Task matching query does not exist.")
+
+    def test_non_owner_cannot_assign(self):
+        owner = User.objects.create_user(username="owner", password="secret")
+        org = Organization.objects.create(name="Acme", slug="acme", owner=owner)
+        project = Project.objects.create(organization=org, name="Launch")
+        task = Task.objects.create(project=project, title="Todo")
+        self.assertEqual(self.assign(task.pk), "Only the Organization Admin can assign tasks.")
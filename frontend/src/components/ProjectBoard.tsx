@@ -79,10 +79,14 @@ const GET_PROJECT_DETAILS = gql`
 
 const GET_ALL_ORGS = gql`
   query GetAllOrgs {
-    allOrganizations {
-      id
-      name
-      projects { id name }
+    allOrganizations(first: 100) {
+      edges {
+        node {
+          id
+          name
+          projects { id name }
+        }
+      }
     }
   }
 `;
@@ -257,7 +261,7 @@ export const ProjectBoard: React.FC = () => {
                 {/* Dropdown Menu */}
                 {showOrgMenu && orgsData && (
                     <div className="absolute top-full left-0 mt-3 w-72 bg-white border border-slate-100 rounded-2xl shadow-xl z-50 max-h-96 overflow-y-auto animate-fade-in-down ring-1 ring-black/5">
-                        {orgsData.allOrganizations.map((org: any) => (
+                        {orgsData.allOrganizations.edges.map(({ node: org }: any) => (
                             <div key={org.id} className="p-3 border-b border-slate-50 last:border-0">
                                 <div className="text-[10px] font-bold text-slate-400 px-2 py-1 uppercase tracking-wider">{org.name}</div>
                                 {org.projects.map((proj: any) => (